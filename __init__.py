@@ -1,5 +1,6 @@
 from .transform.FASTA_ALPHA import fasta_alpha
 from .transform.ALPHA_NX import alpha_nx
+from .transform.protein_graph import ProteinGraph
 from .transform.NX_PyG import nx_pyg
 from .transform.GO.GO_labels import go_labels
 from .transform.ESM2.ESM2_labels import esm2_labels
@@ -11,5 +12,6 @@ from .transform.eigen_posenc import precompute_eigens
 from .transform.minmax_norm import minmax_norm
 from .transform.GO.GO_split import go_split
 from .transform.foldseek.foldseek_targets import foldseek_targets
+from .loader.alphafold_dataset import Alphafold
 from .utils.delete_y import delete_y
 from .utils.to_f16 import convert_to_float16
@@ -1,111 +1,239 @@
-# Alphafold + RDKit + DSSP > NetworkX Graph Representation of Proteins
+# Alphafold + RDKit + DSSP > Structure-of-arrays Graph Representation of Proteins
 import os
 import pickle
 import json
 import numpy as np
-import concurrent
-import networkx as nx
-from rdkit import Chem
-from rdkit.Chem import rdMolTransforms
+import torch
+import concurrent.futures
+import subprocess
 from Bio.PDB import PDBParser, DSSP
+from Bio.PDB.DSSP import residue_max_acc
+from Bio.Data.IUPACData import protein_letters_1to3
 from tqdm import tqdm
 
-def protein_molecule_graphs(input_dir, output_dir, file_name, include_pae=False):
+try:
+    from rdkit import Chem
+except ImportError:
+    Chem = None
+
+try:
+    import gemmi
+except ImportError:
+    gemmi = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    from .protein_graph import ProteinGraph
+except ImportError:
+    from protein_graph import ProteinGraph
+
+# Per-worker PDBParser singleton, created once per process and reused across tasks
+_PDB_PARSER = None
+
+def _init_worker():
+    global _PDB_PARSER
+    _PDB_PARSER = PDBParser(QUIET=True)
+
+def _get_pdb_parser():
+    global _PDB_PARSER
+    if _PDB_PARSER is None:
+        _PDB_PARSER = PDBParser(QUIET=True)
+    return _PDB_PARSER
+
+def _build_ca_edges(residue_number, is_ca, coords):
+    # Single scan over the atoms, keeping the first CA of each residue and emitting
+    # (src, dst, length) for every consecutive-residue CA pair; compiled with numba
+    # below when it is installed
+    n = residue_number.shape[0]
+    src = np.empty(n, dtype=np.int64)
+    dst = np.empty(n, dtype=np.int64)
+    length = np.empty(n, dtype=np.float32)
+    count = 0
+    prev_res = -1
+    prev_idx = -1
+    for i in range(n):
+        if is_ca[i]:
+            res = residue_number[i]
+            if res == prev_res:
+                continue
+            if prev_idx >= 0 and res == prev_res + 1:
+                dx = coords[i, 0] - coords[prev_idx, 0]
+                dy = coords[i, 1] - coords[prev_idx, 1]
+                dz = coords[i, 2] - coords[prev_idx, 2]
+                src[count] = prev_idx
+                dst[count] = i
+                length[count] = np.sqrt(dx * dx + dy * dy + dz * dz)
+                count += 1
+            prev_res = res
+            prev_idx = i
+    return src[:count].copy(), dst[:count].copy(), length[:count].copy()
+
+if njit is not None:
+    _build_ca_edges = njit(cache=True)(_build_ca_edges)
+
+# Maximum accessible surface area per residue (Sander scale), keyed by one-letter code,
+# used to convert mkdssp's absolute ACC column to the relative exposure Bio.PDB reports
+_MAX_ACC = {one: residue_max_acc['Sander'][three.upper()] for one, three in protein_letters_1to3.items()}
+
+def _parse_dssp_output(text):
+    # Parse mkdssp's fixed-column output into the same per-residue tuples Bio.PDB's
+    # DSSP wrapper yields, keyed by residue number
+    dssp_dict = {}
+    in_body = False
+    for line in text.splitlines():
+        if not in_body:
+            in_body = line.startswith('  #  RESIDUE')
+            continue
+        aa = line[13]
+        if aa == '!':  # Chain break record
+            continue
+        if aa.islower():  # DSSP marks SS-bridged cysteines with lowercase letters
+            aa = 'C'
+
+        res_num = int(line[5:10])
+        ss = line[16]
+        if ss == ' ':
+            ss = '-'
+
+        acc = int(line[34:38])
+        max_acc = _MAX_ACC.get(aa)
+        exposure = min(acc / max_acc, 1.0) if max_acc else 'NA'
+
+        dssp_dict[res_num] = (int(line[:5]), aa, ss, exposure,
+                              float(line[103:109]), float(line[109:115]),
+                              int(line[38:45]), float(line[46:50]),
+                              int(line[50:56]), float(line[57:61]),
+                              int(line[61:67]), float(line[68:72]),
+                              int(line[72:78]), float(line[79:83]))
+
+    return dssp_dict
+
+def protein_molecule_graphs(input_dir, output_dir, file_name, include_pae=False, output_format='pkl'):
     pdb_file_path = os.path.join(input_dir, file_name + '.pdb')
     json_file_path = os.path.join(input_dir, file_name + '.json')
 
-    output_file_name = file_name.split("/")[-1] + '.pkl'
+    output_file_name = file_name.split("/")[-1] + ('.pt' if output_format == 'pt' else '.pkl')
     output_file_path = os.path.join(output_dir, output_file_name)
 
-    # Check if the pickle file already exists in the output directory
+    # Check if the output file already exists in the output directory
     if os.path.exists(output_file_path):
         print(f"{output_file_name} already exists in the output directory.")
         return
 
-    # Create RDKit molecule from PDB file
-    mol = Chem.MolFromPDBFile(pdb_file_path, sanitize=False, removeHs=False)
-    mol.UpdatePropertyCache(strict=False)
-
-    # Get Conformer for 3D coordinates
-    conf = mol.GetConformer()
-
-    # Create a NetworkX undirected graph
-    G = nx.Graph()
-
-    # Parse the PDB file
-    pdb_parser = PDBParser()
-    structure = pdb_parser.get_structure('protein', pdb_file_path)
-
-    # Create a dictionary mapping each RDKit atom index to its full atom name
-    serial_atom_dict = {}
-    for model in structure:
-        for chain in model:
-            for residue in chain:
-                for atom in residue:
-                    serial_atom_dict[atom.serial_number] = atom.get_fullname().strip()
-
-    # Create a dictionary to store the central atom (alpha carbon) of each residue
-    residue_to_ca_atom = {}
-
-    # Iterate through each Atom and add as Nodes, add Atomic Properties as Node Attributes
-    for atom in mol.GetAtoms():
-        atom_idx = atom.GetIdx()
-        atom_name = serial_atom_dict.get(atom.GetMonomerInfo().GetSerialNumber())
-        atomic_number = atom.GetAtomicNum()
-        atom_coords = conf.GetAtomPosition(atom_idx)
-        degree = atom.GetDegree()
-        aromatic = atom.GetIsAromatic()
-        residue_number = atom.GetMonomerInfo().GetResidueNumber()
-        residue_name = atom.GetMonomerInfo().GetResidueName()
-
-        G.add_node(atom_idx, atom_name=atom_name, atomic_number=atomic_number, atom_coords=atom_coords,
-                  degree=degree, aromatic=aromatic, residue_number=residue_number, residue_name=residue_name)
-
-        # If this atom is the alpha carbon, store it as the central atom of this residue
-        if atom_name == 'CA':
-            residue_to_ca_atom[residue_number] = atom_idx
-
-    # Iterate through the Bonds and add as Edges, add Bond Information as Edge Attributes
-    for bond in mol.GetBonds():
-        atom_i = bond.GetBeginAtom().GetIdx()
-        atom_j = bond.GetEndAtom().GetIdx()
-        bond_idx = bond.GetIdx()
-        bond_order = bond.GetBondTypeAsDouble()
-        bond_length = rdMolTransforms.GetBondLength(conf, atom_i, atom_j)
-
-        G.add_edge(atom_i, atom_j, bond_idx=bond_idx, bond_order=bond_order, bond_length=bond_length)
-
-    # Calculate Euclidean distance between two atoms
-    def calculate_distance(atom1_idx, atom2_idx, graph):
-        pos1 = np.array(graph.nodes[atom1_idx]['atom_coords'])
-        pos2 = np.array(graph.nodes[atom2_idx]['atom_coords'])
-        return np.linalg.norm(pos1 - pos2)
-    
+    # Build the per-atom node arrays and covalent bond arrays. RDKit is preferred for
+    # its bond and aromaticity perception; without it, everything is read from gemmi
+    # in a single parse and bonds are inferred with a distance-cutoff KD-tree query
+    structure = None
+    if Chem is not None:
+        # Create RDKit molecule from PDB file
+        mol = Chem.MolFromPDBFile(pdb_file_path, sanitize=False, removeHs=False)
+        mol.UpdatePropertyCache(strict=False)
+
+        # Get Conformer for 3D coordinates
+        conf = mol.GetConformer()
+
+        # Create a dictionary mapping each atom serial number to its full atom name.
+        # gemmi's C++ parser is 1-2 orders of magnitude faster than Bio.PDB's pure-Python
+        # PDBParser, so prefer it when installed and fall back to Bio.PDB otherwise
+        serial_atom_dict = {}
+        if gemmi is not None:
+            gemmi_structure = gemmi.read_structure(pdb_file_path, merge_chain_parts=True)
+            for chain in gemmi_structure[0]:
+                for residue in chain:
+                    for atom in residue:
+                        serial_atom_dict[atom.serial] = atom.name
+        else:
+            structure = _get_pdb_parser().get_structure('protein', pdb_file_path)
+            for model in structure:
+                for chain in model:
+                    for residue in chain:
+                        for atom in residue:
+                            serial_atom_dict[atom.serial_number] = atom.get_fullname().strip()
+
+        # Fill each per-atom node array with one bulk pass over the molecule instead of
+        # mixed accessor calls per atom; the conformer returns all coordinates as an
+        # (N,3) array in a single C++ call, and the monomer info objects are fetched once
+        n_atoms = mol.GetNumAtoms()
+        atoms = list(mol.GetAtoms())
+        monomer_infos = [atom.GetMonomerInfo() for atom in atoms]
+        atom_name = np.array([serial_atom_dict.get(info.GetSerialNumber()) for info in monomer_infos], dtype=object)
+        atomic_number = np.fromiter((atom.GetAtomicNum() for atom in atoms), dtype=np.int16, count=n_atoms)
+        coords = np.asarray(conf.GetPositions(), dtype=np.float32)
+        degree = np.fromiter((atom.GetDegree() for atom in atoms), dtype=np.int16, count=n_atoms)
+        aromatic = np.fromiter((atom.GetIsAromatic() for atom in atoms), dtype=np.bool_, count=n_atoms)
+        residue_number = np.fromiter((info.GetResidueNumber() for info in monomer_infos), dtype=np.int32, count=n_atoms)
+        residue_name = np.array([info.GetResidueName() for info in monomer_infos], dtype=object)
+        # Note: Alphafold stores the residue pLDDT in the B-factor field of every atom,
+        # which RDKit already exposes - no second structure traversal needed
+        plddt = np.fromiter((info.GetTempFactor() for info in monomer_infos), dtype=np.float32, count=n_atoms)
+
+        # Gather the Bond endpoint indices and orders, then compute all bond lengths in one
+        # vectorized coordinate-difference norm instead of per-bond rdMolTransforms calls
+        n_bonds = mol.GetNumBonds()
+        edge_src = np.fromiter((bond.GetBeginAtomIdx() for bond in mol.GetBonds()), dtype=np.int64, count=n_bonds)
+        edge_dst = np.fromiter((bond.GetEndAtomIdx() for bond in mol.GetBonds()), dtype=np.int64, count=n_bonds)
+        edge_bond_order = np.fromiter((bond.GetBondTypeAsDouble() for bond in mol.GetBonds()), dtype=np.float32, count=n_bonds)
+    else:
+        if gemmi is None or cKDTree is None:
+            raise ImportError("protein_molecule_graphs requires rdkit, or gemmi plus scipy, to parse PDB files")
+
+        # Single gemmi parse; read the node arrays straight off the structure
+        gemmi_structure = gemmi.read_structure(pdb_file_path, merge_chain_parts=True)
+        gemmi_atoms = [(atom.name, atom.element.atomic_number, atom.pos.x, atom.pos.y, atom.pos.z,
+                        residue.seqid.num, residue.name, atom.b_iso)
+                       for chain in gemmi_structure[0] for residue in chain for atom in residue]
+        n_atoms = len(gemmi_atoms)
+        atom_name = np.array([a[0] for a in gemmi_atoms], dtype=object)
+        atomic_number = np.fromiter((a[1] for a in gemmi_atoms), dtype=np.int16, count=n_atoms)
+        coords = np.array([a[2:5] for a in gemmi_atoms], dtype=np.float32)
+        residue_number = np.fromiter((a[5] for a in gemmi_atoms), dtype=np.int32, count=n_atoms)
+        residue_name = np.array([a[6] for a in gemmi_atoms], dtype=object)
+        plddt = np.fromiter((a[7] for a in gemmi_atoms), dtype=np.float32, count=n_atoms)
+        # Aromaticity perception needs RDKit
+        aromatic = np.zeros(n_atoms, dtype=np.bool_)
+
+        # Infer covalent bonds from a 1.9 A distance cutoff; the KD-tree pair query is
+        # O(N log N) in pure C. Bond orders are not perceived on this path
+        pairs = cKDTree(coords).query_pairs(r=1.9, output_type='ndarray')
+        n_bonds = len(pairs)
+        edge_src = pairs[:, 0].astype(np.int64)
+        edge_dst = pairs[:, 1].astype(np.int64)
+        edge_bond_order = np.ones(n_bonds, dtype=np.float32)
+        degree = np.bincount(np.concatenate([edge_src, edge_dst]), minlength=n_atoms).astype(np.int16)
+
+    edge_bond_idx = np.arange(n_bonds, dtype=np.int64)
+    edge_bond_length = np.linalg.norm(coords[edge_src] - coords[edge_dst], axis=1).astype(np.float32)
+
+    # Locate the central atom (alpha carbon) of each residue with a vectorized mask,
+    # and assign each residue a dense row index with an atom->row map
+    ca_mask = atom_name == 'CA'
+    ca_atom_indices = np.nonzero(ca_mask)[0].astype(np.int64)
+    ca_res_nums = residue_number[ca_mask].astype(np.int64)
+    res_nums = np.unique(residue_number)
+    res_row = {res_num: row for row, res_num in enumerate(res_nums.tolist())}
+    n_res = len(res_nums)
+    atom_to_res = np.fromiter((res_row[r] for r in residue_number.tolist()), dtype=np.int32, count=n_atoms)
+
     # Add edges between CA atoms of consecutive residues to represent residue level structure
-    for res_num, ca_idx in residue_to_ca_atom.items():
-        next_ca_idx = residue_to_ca_atom.get(res_num + 1)
-        if next_ca_idx is not None:
-            bond_length = calculate_distance(ca_idx, next_ca_idx, G)
-            
-            G.add_edge(ca_idx, next_ca_idx, bond_idx=0, bond_order=0, bond_length=bond_length)
-
-    # Identify pLDDT as Node Attributes and PAE as Edges
-    # Create a dictionary mapping each residue to its pLDDT value
-    plddt_dict = {}
-    for model in structure:
-        for chain in model:
-            for residue in chain:
-                # Note: assumes that the pLDDT is stored in the B-factor field of the alpha carbon atom
-                plddt = residue['CA'].get_bfactor()
-                plddt_dict[residue.get_id()[1]] = plddt
-
-    # Add pLDDT as Node Attributes
-    for atom in mol.GetAtoms():
-        residue_number = atom.GetMonomerInfo().GetResidueNumber()
-        plddt = plddt_dict.get(residue_number)
-        G.nodes[atom.GetIdx()]['plddt'] = plddt
-
-    # Parse JSON file, Add PAE as Edges only if include_pae is True
+    ca_src, ca_dst, ca_length = _build_ca_edges(residue_number, ca_mask, coords)
+
+    edge_src = np.concatenate([edge_src, ca_src])
+    edge_dst = np.concatenate([edge_dst, ca_dst])
+    edge_bond_idx = np.concatenate([edge_bond_idx, np.zeros(len(ca_src), dtype=np.int64)])
+    edge_bond_order = np.concatenate([edge_bond_order, np.zeros(len(ca_src), dtype=np.float32)])
+    edge_bond_length = np.concatenate([edge_bond_length, ca_length])
+
+    # Parse JSON file, Add PAE as Edges between CA atoms only if include_pae is True
+    pae_src, pae_dst, pae_val = [], [], []
     if include_pae:
         try:
             with open(json_file_path, 'r') as f:
@@ -114,17 +242,24 @@ def protein_molecule_graphs(input_dir, output_dir, file_name, include_pae=False)
             if not 'predicted_aligned_error' in pae_data[0]:
                 raise ValueError('No predicted_aligned_error in JSON')
 
-            pae_matrix = pae_data[0]['predicted_aligned_error']
-
-            for i in range(len(pae_matrix)):
-                for j in range(len(pae_matrix[i])):
-                    if i != j:  # Skip self-loops
-                        pae = pae_matrix[i][j]
-                        ca_atom_i = residue_to_ca_atom.get(i + 1)
-                        ca_atom_j = residue_to_ca_atom.get(j + 1)
-
-                        if ca_atom_i is not None and ca_atom_j is not None:
-                            G.add_edge(ca_atom_i, ca_atom_j, pae=pae)
+            pae_matrix = np.asarray(pae_data[0]['predicted_aligned_error'], dtype=np.float32)
+
+            # Map each residue number (1-based) to its CA atom index, -1 where absent,
+            # with one masked scatter instead of a per-residue Python loop
+            n_res_pae = pae_matrix.shape[0]
+            res_to_ca = np.full(n_res_pae, -1, dtype=np.int64)
+            in_range = (ca_res_nums >= 1) & (ca_res_nums <= n_res_pae)
+            res_to_ca[ca_res_nums[in_range] - 1] = ca_atom_indices[in_range]
+
+            # One boolean mask selects all valid CA pairs, excluding self-loops,
+            # replacing the R^2 Python double loop
+            valid = res_to_ca >= 0
+            mask = valid[:, None] & valid[None, :]
+            np.fill_diagonal(mask, False)
+            ii, jj = np.nonzero(mask)
+            pae_src = res_to_ca[ii]
+            pae_dst = res_to_ca[jj]
+            pae_val = pae_matrix[ii, jj]
 
         except json.JSONDecodeError:
             print(f"Cannot decode JSON from file {file_name}. Please check the JSON file.")
@@ -136,10 +271,32 @@ def protein_molecule_graphs(input_dir, output_dir, file_name, include_pae=False)
             print(f"Unexpected error in file {file_name}: {str(e)}")
             return
 
+    # DSSP values are stored once per residue - one packed float32 row plus the
+    # secondary-structure letter - rather than duplicated across every atom;
+    # rows stay at their defaults for residues DSSP does not report
+    ss_by_res = np.full(n_res, '-', dtype=object)
+    dssp_by_res = np.zeros((n_res, 11), dtype=np.float32)
+
     # Identify DSSP Secondary Structures, Solvent Available Surface Area, Torsion Angles, Hygrogen Bond Strengths. Map the DSSP data to residue identifiers as Node Attributes
     def run_dssp(pdb_file):
-        p = PDBParser()
-        s = p.get_structure("protein", pdb_file)
+        # Pipe the file straight into mkdssp and parse its fixed-column output, instead
+        # of re-parsing the structure in pure Python just to drive the subprocess.
+        # mkdssp 4 picks its output format from the output file extension and emits
+        # mmCIF on stdout by default, so ask for classic output explicitly; mkdssp 3
+        # does not know the flag, so retry without it
+        for args in (['mkdssp', '--output-format=dssp', pdb_file, '-'], ['mkdssp', pdb_file, '-']):
+            try:
+                result = subprocess.run(args, capture_output=True, text=True, check=True)
+            except (OSError, subprocess.CalledProcessError):
+                continue
+            dssp_dict = _parse_dssp_output(result.stdout)
+            if dssp_dict:
+                return dssp_dict
+
+        # Fall back to Bio.PDB's DSSP wrapper - also when mkdssp produced output the
+        # parser found no residues in - reusing the already-parsed structure when
+        # there is one
+        s = structure if structure is not None else _get_pdb_parser().get_structure('protein', pdb_file)
         model = s[0]
         dssp = DSSP(model, pdb_file)
 
@@ -153,43 +310,53 @@ def protein_molecule_graphs(input_dir, output_dir, file_name, include_pae=False)
     try:
         dssp_data = run_dssp(pdb_file_path)
 
-        for node, data in G.nodes(data=True):
-            if data['residue_number'] in dssp_data:
-                dssp_node_data = dssp_data[data['residue_number']]
-
-                # Unpack DSSP data
-                (dssp_index, aa, ss, exposure, phi, psi, NH_O_1_relidx, NH_O_1_energy, O_NH_1_relidx, O_NH_1_energy,
-                NH_O_2_relidx, NH_O_2_energy, O_NH_2_relidx, O_NH_2_energy) = dssp_node_data
-
-                # Update node attributes
-                G.nodes[node]['secondary_structure'] = ss
-                G.nodes[node]['exposure'] = exposure
-                G.nodes[node]['phi'] = phi
-                G.nodes[node]['psi'] = psi
-                G.nodes[node]['NH_O_1_relidx'] = NH_O_1_relidx
-                G.nodes[node]['NH_O_1_energy'] = NH_O_1_energy
-                G.nodes[node]['O_NH_1_relidx'] = O_NH_1_relidx
-                G.nodes[node]['O_NH_1_energy'] = O_NH_1_energy
-                G.nodes[node]['NH_O_2_relidx'] = NH_O_2_relidx
-                G.nodes[node]['NH_O_2_energy'] = NH_O_2_energy
-                G.nodes[node]['O_NH_2_relidx'] = O_NH_2_relidx
-                G.nodes[node]['O_NH_2_energy'] = O_NH_2_energy
+        # Write each DSSP row once, into its residue's slot
+        for res_num, dssp_node_data in dssp_data.items():
+            row = res_row.get(res_num)
+            if row is None:
+                continue
+
+            # Unpack DSSP data
+            (dssp_index, aa, ss, res_exposure, res_phi, res_psi, res_NH_O_1_relidx, res_NH_O_1_energy,
+            res_O_NH_1_relidx, res_O_NH_1_energy, res_NH_O_2_relidx, res_NH_O_2_energy,
+            res_O_NH_2_relidx, res_O_NH_2_energy) = dssp_node_data
+
+            ss_by_res[row] = ss
+            dssp_by_res[row] = (res_exposure, res_phi, res_psi,
+                                res_NH_O_1_relidx, res_NH_O_1_energy, res_O_NH_1_relidx, res_O_NH_1_energy,
+                                res_NH_O_2_relidx, res_NH_O_2_energy, res_O_NH_2_relidx, res_O_NH_2_energy)
 
     except Exception as e:
         print(f"Failed to run DSSP for {file_name}: {e}")
-        # Optionally delete the current protein graph here if needed
-        # del G
         return
 
-    # Convert atom_coords to string
-    for node, data in G.nodes(data=True):
-        atom_coords = data['atom_coords']
-        atom_coords_str = f"{atom_coords.x},{atom_coords.y},{atom_coords.z}"
-        data['atom_coords'] = atom_coords_str
-
-    # Save graph to pickle file
-    with open(output_file_path, 'wb') as f:
-        pickle.dump(G, f)
+    graph = ProteinGraph(atom_name=atom_name,
+                         atomic_number=atomic_number,
+                         coords=coords,
+                         degree=degree,
+                         aromatic=aromatic,
+                         residue_number=residue_number,
+                         residue_name=residue_name,
+                         plddt=plddt,
+                         atom_to_res=atom_to_res,
+                         ss_by_res=ss_by_res,
+                         dssp_by_res=dssp_by_res,
+                         edge_src=edge_src,
+                         edge_dst=edge_dst,
+                         edge_bond_idx=edge_bond_idx,
+                         edge_bond_order=edge_bond_order,
+                         edge_bond_length=edge_bond_length,
+                         pae_src=np.asarray(pae_src, dtype=np.int64),
+                         pae_dst=np.asarray(pae_dst, dtype=np.int64),
+                         pae_val=np.asarray(pae_val, dtype=np.float32))
+
+    # Save the graph; 'pt' writes PyG-ready tensors directly and skips the separate
+    # pickle -> torch conversion pass over every file
+    if output_format == 'pt':
+        torch.save(graph.to_tensor_dict(), output_file_path)
+    else:
+        with open(output_file_path, 'wb') as f:
+            pickle.dump(graph, f)
 
 def process_file_wrapper(args):
     """
@@ -197,32 +364,61 @@ def process_file_wrapper(args):
     """
     return protein_molecule_graphs(*args)
 
-def alpha_nx(input_dir, output_dir, include_pae=False, max_workers=None):
+def alpha_nx(input_dir, output_dir, include_pae=False, max_workers=None, output_format='pkl'):
     os.makedirs(output_dir, exist_ok=True)
-    processed_files = [f for f in os.listdir(output_dir) if f.endswith('.pkl')]
-
-    # Prepare a list of arguments for each file to be processed
-    tasks = []
-    for file in os.listdir(input_dir):
-        if file.endswith(".pdb"):
-            file_name_without_extension = os.path.splitext(file)[0]
-            output_file_name = file_name_without_extension + '.pkl'
-
-            if output_file_name in processed_files:
-                continue
-
-            task_args = (input_dir, output_dir, file_name_without_extension, include_pae)
-            tasks.append(task_args)
-
-    # Use ProcessPoolExecutor to process files in parallel
-    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-        # Map the protein_molecule_graphs function to the tasks
-        # results = list(executor.map(process_file_wrapper, tasks))
-        results = list(tqdm(executor.map(process_file_wrapper, tasks), total=len(tasks), desc="Processing PDB Files into NetworkX Graphs"))
+    output_ext = '.pt' if output_format == 'pt' else '.pkl'
+
+    # Snapshot the already-processed outputs once; scandir reuses a single stat per
+    # entry and the set makes every skip check O(1) instead of a linear scan
+    processed_files = {entry.name for entry in os.scandir(output_dir) if entry.name.endswith(output_ext)}
+
+    # Generate the arguments for each file to be processed lazily, feeding the
+    # bounded submission window below without materializing a task list
+    def tasks():
+        for entry in os.scandir(input_dir):
+            if entry.name.endswith(".pdb"):
+                file_name_without_extension = os.path.splitext(entry.name)[0]
+
+                if file_name_without_extension + output_ext in processed_files:
+                    continue
+
+                yield (input_dir, output_dir, file_name_without_extension, include_pae, output_format)
+
+    # Use ProcessPoolExecutor to process files in parallel; the initializer builds the
+    # per-worker PDBParser once. Tasks are fed through a bounded window of in-flight
+    # futures rather than mapped eagerly, so memory stays flat on large corpora and
+    # results are dropped as soon as they complete (the workers write to disk)
+    workers = max_workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+        with tqdm(desc="Processing PDB Files into Protein Graphs") as pbar:
+            inflight = set()
+            task_files = {}
+
+            def drain(done):
+                # Retrieve every completed result so worker exceptions surface
+                # instead of being discarded with the future
+                for future in done:
+                    file_name = task_files.pop(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Failed to process {file_name}: {e}")
+                pbar.update(len(done))
+
+            for task_args in tasks():
+                if len(inflight) >= 2 * workers:
+                    done, inflight = concurrent.futures.wait(inflight, return_when=concurrent.futures.FIRST_COMPLETED)
+                    drain(done)
+                future = executor.submit(process_file_wrapper, task_args)
+                task_files[future] = task_args[2]
+                inflight.add(future)
+            while inflight:
+                done, inflight = concurrent.futures.wait(inflight, return_when=concurrent.futures.FIRST_COMPLETED)
+                drain(done)
 
 if __name__ == "__main__":
-    
+
     input_dir = 'path/to/input_directory'
     output_dir = 'path/to/output_directory'
-    
+
     alpha_nx(input_dir, output_dir)
@@ -12,6 +12,21 @@ import numpy as np
 import csv
 from tqdm import tqdm
 
+try:
+    from .protein_graph import ProteinGraph
+except ImportError:
+    from protein_graph import ProteinGraph
+
+def load_graph(filepath):
+    with open(filepath, 'rb') as file:
+        G = pickle.load(file)
+
+    # Structure-of-arrays pickles are converted back to NetworkX for processing
+    if isinstance(G, ProteinGraph):
+        G = G.to_networkx()
+
+    return G
+
 def save_encoders(encoders, directory):
     for name, encoder in encoders.items():
         with open(os.path.join(directory, f'{name}_encoder.pkl'), 'wb') as f:
@@ -37,13 +52,12 @@ def process_categories(input_dir, categories_path):
     unique_atom_names, unique_atom_types, unique_residue_names, unique_secondary_structures = set(), set(), set(), set()
     for filename in os.listdir(input_dir):
         if filename.endswith(".pkl"):
-            with open(os.path.join(input_dir, filename), 'rb') as file:
-                G = pickle.load(file)
-                for _, data in G.nodes(data=True):
-                    unique_atom_names.add(data['atom_name'])
-                    unique_atom_types.add(data['atomic_number'])
-                    unique_residue_names.add(data['residue_name'])
-                    unique_secondary_structures.add(data.get('secondary_structure', '-'))
+            G = load_graph(os.path.join(input_dir, filename))
+            for _, data in G.nodes(data=True):
+                unique_atom_names.add(data['atom_name'])
+                unique_atom_types.add(data['atomic_number'])
+                unique_residue_names.add(data['residue_name'])
+                unique_secondary_structures.add(data.get('secondary_structure', '-'))
     
     for ohe, unique_values in zip([ohe_atom_names, ohe_atom_types, ohe_residue_names, ohe_secondary_structures],
                                   [unique_atom_names, unique_atom_types, unique_residue_names, unique_secondary_structures]):
@@ -73,98 +87,101 @@ def process_graph(filename, input_dir, output_dir, encoders, include_pae=False):
     filepath = os.path.join(input_dir, filename)
 
     # Load the NetworkX graph
-    with open(filepath, 'rb') as file:
-        G = pickle.load(file)
-
-        # a dictionary to map node IDs to integers
-        node_mapping = defaultdict(int)
-
-        # Map node labels to integers
-        for i, node in enumerate(G.nodes()):
-            node_mapping[node] = i
-
-        # Prepare features for edges
-        edge_index = []
-        edge_feat = []
-
-        # Prepare node features
-        feat = []
-
-        # Prepare atom coordinates separately
-        atom_coords_list = []
-
-        for node, data in G.nodes(data=True):
-            # Node features
-            atom_coords = torch.tensor([float(i) for i in data['atom_coords'].split(",")], dtype=torch.float16)
-            atom_coords_list.append(atom_coords)
-            feat.append(torch.cat([torch.tensor(ohe_atom_names.transform([[data['atom_name']]]), dtype=torch.float16).squeeze(0),
-                    torch.tensor(ohe_atom_types.transform([[data['atomic_number']]]), dtype=torch.float16).squeeze(0),
-                    torch.tensor(ohe_residue_names.transform([[data['residue_name']]]), dtype=torch.float16).squeeze(0),
-                    torch.tensor(ohe_secondary_structures.transform([[data.get('secondary_structure', '-')]]), dtype=torch.float16).squeeze(0),
-                    torch.tensor([[data['degree'],
-                                  data['aromatic'],
-                                  data['residue_number'],
-                                  data['plddt'],
-                                  data.get('exposure', 0),
-                                  data.get('phi', 0),
-                                  data.get('psi', 0),
-                                  data.get('NH_O_1_relidx', 0),
-                                  data.get('NH_O_1_energy', 0),
-                                  data.get('O_NH_1_relidx', 0),
-                                  data.get('O_NH_1_energy', 0),
-                                  data.get('NH_O_2_relidx', 0),
-                                  data.get('NH_O_2_energy', 0),
-                                  data.get('O_NH_2_relidx', 0),
-                                  data.get('O_NH_2_energy', 0)]], dtype=torch.float16).squeeze(0)
-                ], dim=0))
-
-        for node1, node2, data in G.edges(data=True):
-            # Skip edges with 'pae' attribute if include_pae is False
-            if not include_pae and 'pae' in data:
-                continue
-                
-            # Edge feature construction
-            if include_pae and 'pae' in data:
-                edge_features = [
-                    # data.get('bond_idx', 0),
-                    data.get('bond_order', 0),
-                    data.get('bond_length', 0),
-                    data.get('pae', 0)
-                ]
-            else:
-                edge_features = [
-                    # data.get('bond_idx', 0),
-                    data.get('bond_order', 0),
-                    data.get('bond_length', 0)
-                ]
-            edge_feat.append(edge_features)
-            edge_index.append((node_mapping[node1], node_mapping[node2]))
-        
-        # Convert lists to tensors
-        edge_index = torch.LongTensor(edge_index).t().contiguous()
-        feat = torch.stack(feat)
-        edge_feat = torch.tensor(edge_feat, dtype=torch.float16)
-
-        # Calculate geometric center and re-align atom_coords
-        atom_coords_array = torch.stack(atom_coords_list)
-        geometric_center = torch.mean(atom_coords_array, dim=0)
-        aligned_atom_coords_list = [coords - geometric_center for coords in atom_coords_array]
-
-        # Update atom_coords with the aligned coords
-        atom_coords = torch.stack(aligned_atom_coords_list)
-
-        # Create the num_nodes attribute
-        num_nodes = feat.shape[0]
-
-        # Construct the PyG graph
-        data = Data(edge_index=edge_index, x=feat, edge_attr=edge_feat, num_nodes=num_nodes, atom_coords=atom_coords)
-
-        # Make graph undirected
-        data.edge_index, data.edge_attr = to_undirected(data.edge_index, data.edge_attr)
-    
-        # Save the PyTorch object to the local file system
-        output_filename = f'{data_object_name}.pt'
-        torch.save(data, os.path.join(output_dir, output_filename))
+    G = load_graph(filepath)
+
+    # a dictionary to map node IDs to integers
+    node_mapping = defaultdict(int)
+
+    # Map node labels to integers
+    for i, node in enumerate(G.nodes()):
+        node_mapping[node] = i
+
+    # Prepare features for edges
+    edge_index = []
+    edge_feat = []
+
+    # Prepare node features
+    feat = []
+
+    # Prepare atom coordinates separately
+    atom_coords_list = []
+
+    for node, data in G.nodes(data=True):
+        # Node features
+        atom_coords = data['atom_coords']
+        if isinstance(atom_coords, str):
+            # Legacy pickles stored coordinates as an "x,y,z" string
+            atom_coords = [float(i) for i in atom_coords.split(",")]
+        atom_coords = torch.tensor(atom_coords, dtype=torch.float16)
+        atom_coords_list.append(atom_coords)
+        feat.append(torch.cat([torch.tensor(ohe_atom_names.transform([[data['atom_name']]]), dtype=torch.float16).squeeze(0),
+                torch.tensor(ohe_atom_types.transform([[data['atomic_number']]]), dtype=torch.float16).squeeze(0),
+                torch.tensor(ohe_residue_names.transform([[data['residue_name']]]), dtype=torch.float16).squeeze(0),
+                torch.tensor(ohe_secondary_structures.transform([[data.get('secondary_structure', '-')]]), dtype=torch.float16).squeeze(0),
+                torch.tensor([[data['degree'],
+                              data['aromatic'],
+                              data['residue_number'],
+                              data['plddt'],
+                              data.get('exposure', 0),
+                              data.get('phi', 0),
+                              data.get('psi', 0),
+                              data.get('NH_O_1_relidx', 0),
+                              data.get('NH_O_1_energy', 0),
+                              data.get('O_NH_1_relidx', 0),
+                              data.get('O_NH_1_energy', 0),
+                              data.get('NH_O_2_relidx', 0),
+                              data.get('NH_O_2_energy', 0),
+                              data.get('O_NH_2_relidx', 0),
+                              data.get('O_NH_2_energy', 0)]], dtype=torch.float16).squeeze(0)
+            ], dim=0))
+
+    for node1, node2, data in G.edges(data=True):
+        # Skip edges with 'pae' attribute if include_pae is False
+        if not include_pae and 'pae' in data:
+            continue
+
+        # Edge feature construction
+        if include_pae and 'pae' in data:
+            edge_features = [
+                # data.get('bond_idx', 0),
+                data.get('bond_order', 0),
+                data.get('bond_length', 0),
+                data.get('pae', 0)
+            ]
+        else:
+            edge_features = [
+                # data.get('bond_idx', 0),
+                data.get('bond_order', 0),
+                data.get('bond_length', 0)
+            ]
+        edge_feat.append(edge_features)
+        edge_index.append((node_mapping[node1], node_mapping[node2]))
+
+    # Convert lists to tensors
+    edge_index = torch.LongTensor(edge_index).t().contiguous()
+    feat = torch.stack(feat)
+    edge_feat = torch.tensor(edge_feat, dtype=torch.float16)
+
+    # Calculate geometric center and re-align atom_coords
+    atom_coords_array = torch.stack(atom_coords_list)
+    geometric_center = torch.mean(atom_coords_array, dim=0)
+    aligned_atom_coords_list = [coords - geometric_center for coords in atom_coords_array]
+
+    # Update atom_coords with the aligned coords
+    atom_coords = torch.stack(aligned_atom_coords_list)
+
+    # Create the num_nodes attribute
+    num_nodes = feat.shape[0]
+
+    # Construct the PyG graph
+    data = Data(edge_index=edge_index, x=feat, edge_attr=edge_feat, num_nodes=num_nodes, atom_coords=atom_coords)
+
+    # Make graph undirected
+    data.edge_index, data.edge_attr = to_undirected(data.edge_index, data.edge_attr)
+
+    # Save the PyTorch object to the local file system
+    output_filename = f'{data_object_name}.pt'
+    torch.save(data, os.path.join(output_dir, output_filename))
 
 def process_file(args):
     filename, input_dir, output_dir, categories_dir, include_pae = args
@@ -0,0 +1,115 @@
+# Structure-of-arrays container for protein graphs
+import numpy as np
+import networkx as nx
+import torch
+from dataclasses import dataclass
+
+@dataclass
+class ProteinGraph:
+    # Per-atom node arrays
+    atom_name: np.ndarray
+    atomic_number: np.ndarray
+    coords: np.ndarray
+    degree: np.ndarray
+    aromatic: np.ndarray
+    residue_number: np.ndarray
+    residue_name: np.ndarray
+    plddt: np.ndarray
+    # DSSP values are identical for all atoms of a residue, so they are stored once
+    # per residue: atom_to_res maps each atom to its row, ss_by_res holds the
+    # secondary-structure letter, and dssp_by_res packs the numeric values with
+    # columns (exposure, phi, psi, NH_O_1_relidx, NH_O_1_energy, O_NH_1_relidx,
+    # O_NH_1_energy, NH_O_2_relidx, NH_O_2_energy, O_NH_2_relidx, O_NH_2_energy)
+    atom_to_res: np.ndarray
+    ss_by_res: np.ndarray
+    dssp_by_res: np.ndarray
+    # Covalent and CA-CA backbone edges
+    edge_src: np.ndarray
+    edge_dst: np.ndarray
+    edge_bond_idx: np.ndarray
+    edge_bond_order: np.ndarray
+    edge_bond_length: np.ndarray
+    # PAE edges between CA atoms
+    pae_src: np.ndarray
+    pae_dst: np.ndarray
+    pae_val: np.ndarray
+
+    def num_atoms(self):
+        return len(self.atomic_number)
+
+    def to_tensor_dict(self):
+        # Plain dict of tensors, loadable with torch.load(weights_only=True);
+        # string-valued arrays are stored as plain lists for the same reason
+        return {
+            'edge_index': torch.from_numpy(np.stack([self.edge_src, self.edge_dst])),
+            'edge_attr': torch.from_numpy(np.stack([self.edge_bond_order, self.edge_bond_length], axis=1)),
+            'pos': torch.from_numpy(self.coords),
+            'atom_name': self.atom_name.tolist(),
+            'atomic_number': torch.from_numpy(self.atomic_number.astype(np.int64)),
+            'degree': torch.from_numpy(self.degree.astype(np.int64)),
+            'aromatic': torch.from_numpy(self.aromatic),
+            'residue_number': torch.from_numpy(self.residue_number.astype(np.int64)),
+            'residue_name': self.residue_name.tolist(),
+            'plddt': torch.from_numpy(self.plddt),
+            'atom_to_res': torch.from_numpy(self.atom_to_res.astype(np.int64)),
+            'secondary_structure': self.ss_by_res.tolist(),
+            'dssp_by_res': torch.from_numpy(self.dssp_by_res),
+            'pae_edge_index': torch.from_numpy(np.stack([self.pae_src, self.pae_dst])),
+            'pae': torch.from_numpy(self.pae_val),
+        }
+
+    def to_networkx(self):
+        # Rebuild the NetworkX representation used by the downstream pipeline
+        G = nx.Graph()
+
+        # Accumulate node and edge lists and add them in bulk, avoiding
+        # NetworkX's per-call overhead in add_node/add_edge
+        nodes = []
+        for i in range(self.num_atoms()):
+            nodes.append((i, dict(atom_name=self.atom_name[i],
+                                  atomic_number=int(self.atomic_number[i]),
+                                  atom_coords=self.coords[i],
+                                  degree=int(self.degree[i]),
+                                  aromatic=bool(self.aromatic[i]),
+                                  residue_number=int(self.residue_number[i]),
+                                  residue_name=self.residue_name[i],
+                                  plddt=float(self.plddt[i]))))
+        G.add_nodes_from(nodes)
+
+        # The DSSP attribute dict is built once per residue and applied to each of its
+        # atoms with a single update through the cached _node mapping, instead of
+        # twelve per-atom conversions and assignments
+        node_data = G._node
+        res_atoms = [[] for _ in range(len(self.ss_by_res))]
+        for i, row in enumerate(self.atom_to_res.tolist()):
+            res_atoms[row].append(i)
+        for row, atom_indices in enumerate(res_atoms):
+            dssp_row = self.dssp_by_res[row]
+            attrs = dict(secondary_structure=self.ss_by_res[row],
+                         exposure=float(dssp_row[0]),
+                         phi=float(dssp_row[1]),
+                         psi=float(dssp_row[2]),
+                         NH_O_1_relidx=float(dssp_row[3]),
+                         NH_O_1_energy=float(dssp_row[4]),
+                         O_NH_1_relidx=float(dssp_row[5]),
+                         O_NH_1_energy=float(dssp_row[6]),
+                         NH_O_2_relidx=float(dssp_row[7]),
+                         NH_O_2_energy=float(dssp_row[8]),
+                         O_NH_2_relidx=float(dssp_row[9]),
+                         O_NH_2_energy=float(dssp_row[10]))
+            for atom_idx in atom_indices:
+                node_data[atom_idx].update(attrs)
+
+        G.add_edges_from((int(src), int(dst), dict(bond_idx=int(bond_idx),
+                                                   bond_order=float(bond_order),
+                                                   bond_length=float(bond_length)))
+                         for src, dst, bond_idx, bond_order, bond_length
+                         in zip(self.edge_src, self.edge_dst, self.edge_bond_idx,
+                                self.edge_bond_order, self.edge_bond_length))
+
+        # The index and value arrays are converted with one tolist() call each, so no
+        # per-edge NumPy scalar casts remain in the PAE block
+        G.add_edges_from(zip(self.pae_src.tolist(), self.pae_dst.tolist(),
+                             ({'pae': val} for val in self.pae_val.tolist())))
+
+        return G